@@ -1,7 +1,15 @@
+import functools
+import io
 import json
-from datetime import datetime, timedelta
+import operator
 import sys
 
+# Prefer orjson for reading the JSON data; fall back to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Crucial for handling Unicode characters when printing to console on Windows
 # This ensures sys.stdout uses UTF-8 encoding
 sys.stdout
@@ -14,140 +22,191 @@ for h in range(8, 21): # From 8 AM to 8 PM (20:00)
         TIME_SLOTS.append(f"{h:02d}:30")
 # Example TIME_SLOTS: ['08:00', '08:30', '09:00', '09:30', ..., '20:00']
 
+# Map each slot label to its column index for O(1) lookups
+SLOT_INDEX = {t: i for i, t in enumerate(TIME_SLOTS)}
+# Minutes since midnight of the first slot (08:00)
+FIRST_SLOT_MINUTES = 8 * 60
+
 # Original HOURS for header display purposes (full hours)
 HOURS_FOR_HEADER = [8, 9, 10, 11, 12, 13, 14, 15, 16, 17, 18, 19, 20]
 
 DAYS = ["MON", "TUE", "WED", "THU", "FRI", "SAT", "SUN"]
 
+# Empty 30-minute cells; the last row has no bottom border
+EMPTY_CELL = '<td class="w-12 border-b border-gray-800"></td>'
+EMPTY_CELL_LAST_ROW = '<td class="w-12"></td>'
+
+# Define pastel background colors with good text contrast for each day
+# Shared by the day column and the class cells
+DAY_COLORS = {
+    "MON": "bg-yellow-400",
+    "TUE": "bg-pink-400",
+    "WED": "bg-green-400",
+    "THU": "bg-orange-400",
+    "FRI": "bg-blue-400",
+    "SAT": "bg-purple-400",
+    "SUN": "bg-red-400"
+}
+
+def _parse_hm(time_str):
+    """Parses an HH:MM (or H:MM) string into minutes since midnight."""
+    h, m = time_str.split(":")
+    return int(h) * 60 + int(m)
+
 def load_classes(path):
     """Loads class data from a JSON file."""
+    if orjson is not None:
+        # orjson decodes UTF-8 bytes directly
+        with open(path, 'rb') as f:
+            return orjson.loads(f.read())
     # Explicitly open with utf-8 encoding to ensure correct reading of characters
     with open(path, 'r', encoding='utf8') as f:
         return json.load(f)
 
+@functools.lru_cache(maxsize=None)
 def time_to_colspan(start, duration):
     """
     Calculates the colspan for a class based on its duration,
     where each column represents a 30-minute slot.
     """
-    fmt = "%H:%M"
-    start_dt = datetime.strptime(start, fmt)
-    h_dur, m_dur = map(int, duration.split(":"))
-    
-    total_minutes = h_dur * 60 + m_dur
+    total_minutes = _parse_hm(duration)
     
     # Calculate colspan based on 30-minute intervals, rounding up
     # e.g., 1 hour (60 min) -> 2 slots; 1 hour 30 min (90 min) -> 3 slots
     return max(1, (total_minutes + 29) // 30)
 
+@functools.lru_cache(maxsize=None)
 def get_start_slot_index(start_time_str):
     """
     Finds the index of the starting time slot in TIME_SLOTS.
     Assumes start_time_str is in HH:00 or HH:30 format.
     """
-    try:
-        return TIME_SLOTS.index(start_time_str)
-    except ValueError:
-        # If the time is not exactly on a 00 or 30 mark,
-        # round down to the nearest 30-minute interval for placement.
-        start_dt = datetime.strptime(start_time_str, "%H:%M")
-        minute = start_dt.minute
-        if minute < 30:
-            aligned_time_str = start_dt.strftime("%H:00")
-        else:
-            aligned_time_str = start_dt.strftime("%H:30")
-        
-        try:
-            return TIME_SLOTS.index(aligned_time_str)
-        except ValueError:
-            # Fallback if somehow still not found (shouldn't happen with proper TIME_SLOTS)
-            return 0 # Default to the very beginning if something goes wrong
+    index = SLOT_INDEX.get(start_time_str)
+    if index is not None:
+        return index
 
+    # If the time is not exactly on a 00 or 30 mark (or uses a single-digit hour),
+    # round down to the nearest 30-minute interval for placement.
+    index = (_parse_hm(start_time_str) - FIRST_SLOT_MINUTES) // 30
+    if 0 <= index < len(TIME_SLOTS):
+        return index
+    # Outside the schedule's range
+    return 0 # Default to the very beginning if something goes wrong
 
+
+@functools.lru_cache(maxsize=None)
 def compute_end(start, duration):
     """Computes the end time of a class."""
-    fmt = "%H:%M"
-    start_dt = datetime.strptime(start, fmt)
-    h, m = map(int, duration.split(":"))
-    end_dt = start_dt + timedelta(hours=h, minutes=m)
-    return end_dt.strftime("%H:%M")
+    total = (_parse_hm(start) + _parse_hm(duration)) % (24 * 60)
+    return f"{total // 60:02d}:{total % 60:02d}"
 
-def generate_cell(cls):
-    """Generates the HTML for a single class cell."""
-    span = time_to_colspan(cls["start"], cls["duration"])
-    
-    # Define pastel background colors with good text contrast for each day
-    color_classes = {
-        "MON": "bg-yellow-400",
-        "TUE": "bg-pink-400",
-        "WED": "bg-green-400",
-        "THU": "bg-orange-400",
-        "FRI": "bg-blue-400",
-        "SAT": "bg-purple-400",
-        "SUN": "bg-red-400"
-    }
-    color = color_classes.get(cls["day"], "bg-gray-700 text-neutral-900")
-    
-    html = f'''
+# Translation table for escaping class text placed into the HTML
+HTML_ESCAPE_TABLE = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;'})
+
+def _escape(text):
+    """HTML-escapes text using the precomputed translation table."""
+    return str(text).translate(HTML_ESCAPE_TABLE)
+
+# HTML template for a class cell, filled in by _generate_cell_cached
+CELL_TEMPLATE = '''
         <td colspan="{span}" class="p-3 align-top {color} text-neutral-900 rounded-lg overflow-hidden">
             <div class="text-sm leading-tight">
-                <div class="mb-1 font-semibold">[{cls['start']}-{compute_end(cls['start'], cls['duration'])}]</div>
-                <div class="font-bold">{cls['code']}</div>
-                <div class="mb-1">{cls['title']}</div>
-                <div class="text-xs opacity-90">{cls['room']} | {cls['type']} {cls['section']}</div>
+                <div class="mb-1 font-semibold">[{start}-{end}]</div>
+                <div class="font-bold">{code}</div>
+                <div class="mb-1">{title}</div>
+                <div class="text-xs opacity-90">{room} | {type} {section}</div>
             </div>
         </td>'''
-    return html
-
-def generate_row(day, classes, is_last_row):
-    """Generates the HTML for a single day's row in the schedule."""
-    day_colors = {
-        "MON": "bg-yellow-400",
-        "TUE": "bg-pink-400",
-        "WED": "bg-green-400",
-        "THU": "bg-orange-400",
-        "FRI": "bg-blue-400",
-        "SAT": "bg-purple-400",
-        "SUN": "bg-red-400"
-    }
-    day_color = day_colors.get(day, "bg-gray-800 text-neutral-900 ")
-    
-    # Removed border-b class from here to remove horizontal borders on body rows
-    row = f'<tr class="h-25">'
-    
-    # Sticky day column
-    row += f'<td class="w-48 sticky left-0 z-20 px-4 py-3 font-bold text-center text-neutral-900 border-r border-gray-800 {day_color} whitespace-nowrap{' border-b border-gray-800' if not is_last_row else ''}"> {day} </td>'
-    
+
+def generate_cell(cls, span, end_str):
+    """Generates the HTML for a single class cell."""
+    return _generate_cell_cached(
+        cls["day"], cls["start"], cls["code"], cls["title"],
+        cls["room"], cls["type"], cls["section"], span, end_str
+    )
+
+@functools.lru_cache(maxsize=None)
+def _generate_cell_cached(day, start, code, title, room, type_, section, span, end_str):
+    """Renders a class cell from its fields; identical classes reuse the cached HTML."""
+    color = DAY_COLORS.get(day, "bg-gray-700 text-neutral-900")
+    return CELL_TEMPLATE.format(
+        span=span, color=color, start=start, end=end_str, code=_escape(code),
+        title=_escape(title), room=_escape(room), type=_escape(type_), section=_escape(section)
+    )
+
+def group_classes_by_day(classes):
+    """
+    Groups classes by day in a single pass, deriving every per-class layout field once.
+
+    Returns a dict mapping each day in DAYS to a list of
+    (start minutes, start slot, colspan, end time, class) tuples sorted by start time.
+    Classes on a day outside DAYS are dropped, as they have no row to appear in.
+    """
+    by_day = {day: [] for day in DAYS}
+    for cls in classes:
+        day_classes = by_day.get(cls["day"])
+        if day_classes is None:
+            continue
+        day_classes.append((
+            _parse_hm(cls["start"]),
+            get_start_slot_index(cls["start"]),
+            time_to_colspan(cls["start"], cls["duration"]),
+            compute_end(cls["start"], cls["duration"]),
+            cls,
+        ))
+    for day_classes in by_day.values():
+        day_classes.sort(key=operator.itemgetter(0))
+    return by_day
+
+def layout_gaps(start_slots, spans, n_slots):
+    """
+    Lays out one row using integer slot data only.
+
+    Returns the number of empty cells before each class (zero or negative when
+    classes overlap) and the number of empty cells after the last class.
+    """
+    gaps = []
     slot_ptr = 0 # Pointer to the current 30-minute slot index
-    
-    sorted_classes = sorted([cls for cls in classes if cls['day'] == day], key=lambda x: datetime.strptime(x['start'], "%H:%M"))
-    
-    for cls in sorted_classes:
-        cls_start_slot_index = get_start_slot_index(cls["start"])
-        colspan = time_to_colspan(cls["start"], cls["duration"])
+    for start_slot, span in zip(start_slots, spans):
+        gaps.append(start_slot - slot_ptr)
+        slot_ptr = start_slot + span # Advance slot pointer by the class duration in 30-minute units
+    return gaps, n_slots - slot_ptr
 
-        # Fill empty cells before the class starts
-        empty_slots_before = cls_start_slot_index - slot_ptr
-        for _ in range(empty_slots_before):
-            row += f'<td class="w-12{' border-b border-gray-800' if not is_last_row else ''}"></td>' # Each empty cell is now 30 minutes
-        
-        slot_ptr = cls_start_slot_index
+def generate_row(day, day_classes, is_last_row):
+    """
+    Generates the HTML for a single day's row in the schedule.
+    day_classes is that day's sorted list of tuples from group_classes_by_day.
+    """
+    day_color = DAY_COLORS.get(day, "bg-gray-800 text-neutral-900 ")
+    
+    border = ' border-b border-gray-800' if not is_last_row else ''
+    empty_cell = EMPTY_CELL_LAST_ROW if is_last_row else EMPTY_CELL
 
-        # Add the class cell
-        row += generate_cell(cls)
-        slot_ptr += colspan # Advance slot pointer by the class duration in 30-minute units
+    # Removed border-b class from here to remove horizontal borders on body rows
+    parts = [
+        '<tr class="h-25">',
+        # Sticky day column
+        f'<td class="w-48 sticky left-0 z-20 px-4 py-3 font-bold text-center text-neutral-900 border-r border-gray-800 {day_color} whitespace-nowrap{border}"> {day} </td>',
+    ]
+    
+    gaps, tail = layout_gaps(
+        [cls_tuple[1] for cls_tuple in day_classes],
+        [cls_tuple[2] for cls_tuple in day_classes],
+        len(TIME_SLOTS),
+    )
+    for empty_slots_before, (_minutes, _slot, colspan, end_str, cls) in zip(gaps, day_classes):
+        # Fill empty cells before the class starts, then add the class cell
+        parts.append(empty_cell * empty_slots_before) # Each empty cell is now 30 minutes
+        parts.append(generate_cell(cls, colspan, end_str))
 
     # Fill remaining empty cells until the end of the schedule
-    while slot_ptr < len(TIME_SLOTS):
-        row += f'<td class="w-12{' border-b border-gray-800' if not is_last_row else ''}"></td>' # Each empty cell is now 30 minutes
-        slot_ptr += 1
+    parts.append(empty_cell * tail) # Each empty cell is now 30 minutes
             
-    row += '</tr>'
-    return row
+    parts.append('</tr>')
+    return ''.join(parts)
 
-def generate_schedule_html(classes):
-    """Generates the complete HTML for the weekly schedule."""
-    html = '''<!doctype html>
+# Static document prologue: head, table header and the opening of the body
+HTML_PROLOGUE = ('''<!doctype html>
 <html lang="en" class="scroll-smooth">
 <head>
     <meta charset="UTF-8" /> <!-- THIS LINE IS CRUCIAL FOR THAI CHARACTERS -->
@@ -162,19 +221,38 @@ def generate_schedule_html(classes):
             <thead>
                 <tr class="bg-[#111622] sticky top-0 z-20 border-b border-gray-800">
                     <th class="w-48 sticky left-0 z-[100] bg-[#111622] px-4 py-3 text-left font-semibold text-white rounded-tl-lg border-r border-gray-800">Day/Time</th>'''
-    # Generate header for full hours, each spanning two 30-minute slots
-    for h in HOURS_FOR_HEADER:
-        html += f'<th colspan="2" class="px-4 py-3 w-24 text-center text-gray-300 font-medium whitespace-nowrap border-r border-b border-gray-800">{h}:00</th>'
-    html += '</tr></thead><tbody>'
-    for i, day in enumerate(DAYS):
-        is_last_row = (i == len(DAYS) - 1)
-        html += generate_row(day, classes, is_last_row)
-    html += '''</tbody></table>
+    # Header for full hours, each spanning two 30-minute slots
+    + ''.join(
+        f'<th colspan="2" class="px-4 py-3 w-24 text-center text-gray-300 font-medium whitespace-nowrap border-r border-b border-gray-800">{h}:00</th>'
+        for h in HOURS_FOR_HEADER
+    )
+    + '</tr></thead><tbody>'
+)
+
+# Static document epilogue closing the table and the page
+HTML_EPILOGUE = '''</tbody></table>
     </div>
     <div class="text-right text-xs text-gray-400 p-4 mt-4 select-none">created by Sirapob P.</div>
 </body>
 </html>'''
-    return html
+
+def write_schedule_html(classes, out):
+    """
+    Writes the complete HTML for the weekly schedule to the text stream out,
+    one row at a time, so the whole document is never held in memory.
+    """
+    by_day = group_classes_by_day(classes)
+    out.write(HTML_PROLOGUE)
+    for i, day in enumerate(DAYS):
+        is_last_row = (i == len(DAYS) - 1)
+        out.write(generate_row(day, by_day[day], is_last_row))
+    out.write(HTML_EPILOGUE)
+
+def generate_schedule_html(classes):
+    """Generates the complete HTML for the weekly schedule."""
+    buffer = io.StringIO()
+    write_schedule_html(classes, buffer)
+    return buffer.getvalue()
 
 if __name__ == "__main__":
     import sys
@@ -184,5 +262,5 @@ if __name__ == "__main__":
     data = load_classes(sys.argv[1])
 
     with open(sys.argv[2], 'w', encoding='utf8') as f:
-        f.write(generate_schedule_html(data))
+        write_schedule_html(data, f)
     print(f"Successfully save schedule to {sys.argv[2]}")
\ No newline at end of file
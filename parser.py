@@ -1,30 +1,56 @@
 from bs4 import BeautifulSoup
+import soupsieve as sv # CSS selector engine used by BeautifulSoup
 import json
 from datetime import datetime, timedelta
 import sys # Import the sys module to access command-line arguments
 
-def parse_html_to_json(html_content):
+# Prefer the C-based lxml backend; fall back to the pure-Python parser if it isn't installed
+try:
+    import lxml # noqa: F401
+    BS4_PARSER = 'lxml'
+except ImportError:
+    BS4_PARSER = 'html.parser'
+
+# Prefer orjson for serialising the output JSON; fall back to the standard library
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# CSS selectors for each card field, compiled once and reused for every card
+CARD_SELECTOR = sv.compile('div.card')
+DAY_SELECTOR = sv.compile('div[style="font-weight: 600; font-size: 10px;"]')
+TIME_SELECTOR = sv.compile('div[style="font-weight: 500; font-size: 18px;"]')
+CODE_SELECTOR = sv.compile('div[style="font-weight: 600; font-size: 12px;"]')
+TITLE_SELECTOR = sv.compile('div.cut-word')
+TYPE_SELECTOR = sv.compile('span[class*="badge-blue"], span[class*="badge-orange"]')
+SECTION_SELECTOR = sv.compile('span[style="color: rgb(10, 187, 135);"]')
+
+# The span holding the 'Room' / 'ห้อง' label; the room itself follows it in the same div
+ROOM_LABEL_SELECTOR = sv.compile('span:-soup-contains("Room", "ห้อง")')
+
+def parse_html(html_content):
     """
-    Parses HTML content to extract course information and format it into JSON.
+    Parses HTML content to extract course information.
     Supports both Thai and English HTML structures for the relevant fields.
 
     Args:
         html_content (str): The HTML string containing course data.
 
     Returns:
-        str: A JSON string representing the extracted course data.
+        list: A list of dicts, one per class, with the extracted course data.
     """
-    soup = BeautifulSoup(html_content, 'html.parser')
+    soup = BeautifulSoup(html_content, BS4_PARSER)
     courses_data = []
 
     # Find all card elements, each representing a course
-    course_cards = soup.find_all('div', class_='card')
+    course_cards = CARD_SELECTOR.select(soup)
 
     for card in course_cards:
-        day_element = card.find('div', style="font-weight: 600; font-size: 10px;")
+        day_element = DAY_SELECTOR.select_one(card)
         day = day_element.get_text(strip=True) if day_element else "N/A"
 
-        time_element = card.find('div', style="font-weight: 500; font-size: 18px;")
+        time_element = TIME_SELECTOR.select_one(card)
         time_range = time_element.get_text(strip=True) if time_element else "N/A"
 
         start_time = "N/A"
@@ -51,22 +77,18 @@ def parse_html_to_json(html_content):
                 # Fallback if time parsing fails
                 pass
 
-        code_element = card.find('div', style="font-weight: 600; font-size: 12px;")
+        code_element = CODE_SELECTOR.select_one(card)
         code = code_element.get_text(strip=True) if code_element else "N/A"
 
         # The English title is now consistently the first 'cut-word' div.
-        title_elements = card.find_all('div', class_='cut-word')
-        title = "N/A"
-        if len(title_elements) > 0: # Get the first 'cut-word' div for English title
-            title = title_elements[0].get_text(strip=True) 
+        title_element = TITLE_SELECTOR.select_one(card)
+        title = title_element.get_text(strip=True) if title_element else "N/A"
 
         # Find room element by looking for 'Room' or 'ห้อง' within a span, then extract from its parent div
         room = "N/A"
-        # Look for a span whose text contains 'Room' or 'ห้อง'
-        room_label_span = card.find('span', string=lambda text: text and ('Room' in text or 'ห้อง' in text))
+        room_label_span = ROOM_LABEL_SELECTOR.select_one(card)
         if room_label_span:
-            # The room number is usually directly after the span within the same parent div
-            # Get the text of the parent div and then clean it
+            # The room number is directly after the span within the same parent div
             parent_div_of_room_label = room_label_span.find_parent('div')
             if parent_div_of_room_label:
                 full_room_text = parent_div_of_room_label.get_text(strip=True)
@@ -75,9 +97,9 @@ def parse_html_to_json(html_content):
                     room = full_room_text.replace('Room', '')
                 elif 'ห้อง' in full_room_text:
                     room = full_room_text.replace('ห้อง', '')
-        
+
         # Determine type based on 'Lec', 'Lab', 'บรรยาย', or 'ปฏิบัติ'
-        type_element = card.find('span', class_=lambda x: x and ('badge-blue' in x or 'badge-orange' in x))
+        type_element = TYPE_SELECTOR.select_one(card)
         type_text = type_element.get_text(strip=True) if type_element else "N/A"
         
         course_type = "N/A"
@@ -89,7 +111,7 @@ def parse_html_to_json(html_content):
             course_type = type_text # Fallback for other types if any
 
         # Find section element by looking for 'Section' or 'หมู่'
-        section_element = card.find('span', style="color: rgb(10, 187, 135);")
+        section_element = SECTION_SELECTOR.select_one(card)
         section = section_element.get_text(strip=True) if section_element else "N/A"
 
         courses_data.append({
@@ -103,35 +125,64 @@ def parse_html_to_json(html_content):
             "section": section
         })
 
+    return courses_data
+
+def parse_html_to_json(html_content):
+    """
+    Parses HTML content to extract course information and format it into JSON.
+
+    Args:
+        html_content (str): The HTML string containing course data.
+
+    Returns:
+        str: A JSON string representing the extracted course data.
+    """
+    courses_data = parse_html(html_content)
+    if orjson is not None:
+        return orjson.dumps(courses_data, option=orjson.OPT_INDENT_2).decode('utf-8')
     return json.dumps(courses_data, indent=2, ensure_ascii=False)
 
-# Check if a file path argument is provided
-if len(sys.argv) == 3:
-    html_file_path = sys.argv[1] # Get the file path from the first argument
-    output_file_path = sys.argv[2] # Get the save path from the second argument
+def parse_html_file(html_file_path):
+    """
+    Reads an HTML file and extracts its course information.
 
-else:
-    print("Usage: python your_script_name.py <path_to_html_file> <json_save_file>")
-    sys.exit(1) # Exit if no file path is provided
+    Args:
+        html_file_path (str): Path to the HTML file containing course data.
 
-# Read HTML content from the file
-html_content = ""
-try:
+    Returns:
+        list: A list of dicts, one per class, with the extracted course data.
+    """
     with open(html_file_path, 'r', encoding='utf-8') as file:
-        html_content = file.read()
-except FileNotFoundError:
-    print(f"Error: The file '{html_file_path}' was not found.")
-except Exception as e:
-    print(f"An error occurred while reading the file: {e}")
-
-# Generate the JSON output if content was read successfully
-if html_content:
-    json_output = parse_html_to_json(html_content)
+        return parse_html(file.read())
+
+if __name__ == "__main__":
+    # Check if a file path argument is provided
+    if len(sys.argv) == 3:
+        html_file_path = sys.argv[1] # Get the file path from the first argument
+        output_file_path = sys.argv[2] # Get the save path from the second argument
+
+    else:
+        print("Usage: python your_script_name.py <path_to_html_file> <json_save_file>")
+        sys.exit(1) # Exit if no file path is provided
+
+    # Read HTML content from the file
+    html_content = ""
     try:
-        with open(output_file_path, 'w', encoding='utf-8') as outfile:
-            outfile.write(json_output)
-        print(f"JSON data successfully written to '{output_file_path}'")
+        with open(html_file_path, 'r', encoding='utf-8') as file:
+            html_content = file.read()
+    except FileNotFoundError:
+        print(f"Error: The file '{html_file_path}' was not found.")
     except Exception as e:
-        print(f"An error occurred while writing the JSON to file: {e}")
-else:
-    print("No HTML content to parse. Please check the file path and content.")
+        print(f"An error occurred while reading the file: {e}")
+
+    # Generate the JSON output if content was read successfully
+    if html_content:
+        json_output = parse_html_to_json(html_content)
+        try:
+            with open(output_file_path, 'w', encoding='utf-8') as outfile:
+                outfile.write(json_output)
+            print(f"JSON data successfully written to '{output_file_path}'")
+        except Exception as e:
+            print(f"An error occurred while writing the JSON to file: {e}")
+    else:
+        print("No HTML content to parse. Please check the file path and content.")